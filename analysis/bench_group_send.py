@@ -0,0 +1,88 @@
+"""
+Measure CPU time per broadcast tick as the number of receivers grows.
+
+Compares one GameNetSender fanning out with send_group() against the old
+approach of one GameNetSender per receiver. Packets go to a no-op transport
+and every reliable packet is ACKed right away, so only sender-side work is
+measured.
+
+Usage: python3 analysis/bench_group_send.py [ticks]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from game_net_api import GameNetSender  # noqa: E402
+from game_net_api.base import CHAN_ACK  # noqa: E402
+from game_net_api.utils import pack_packet  # noqa: E402
+
+GROUP_SIZES = [1, 4, 16, 64]
+PAYLOAD = b"w" * 512  # one world-state update
+
+
+class SinkTransport:
+    def sendto(self, data, addr):
+        pass
+
+    def close(self):
+        pass
+
+
+def make_sender(addrs):
+    sender = GameNetSender("Bench")
+    sender._transport = SinkTransport()
+    sender._dest_addr = addrs[0]
+    for addr in addrs:
+        sender.add_peer(addr)
+    return sender
+
+
+async def bench_group(addrs, ticks: int) -> float:
+    sender = make_sender(addrs)
+    cpu0 = time.process_time()
+    for tick in range(ticks):
+        await sender.send_group(PAYLOAD, is_reliable=True)
+        await sender.send_group(PAYLOAD, is_reliable=False)
+        ack = pack_packet(CHAN_ACK, tick)
+        for addr in addrs:
+            sender._process_datagram(ack, addr)
+        await asyncio.sleep(0)  # let cancelled timers finish
+    cpu = time.process_time() - cpu0
+    await sender.close(timeout=0.1)
+    return cpu / ticks
+
+
+async def bench_per_receiver(addrs, ticks: int) -> float:
+    senders = [make_sender([addr]) for addr in addrs]
+    cpu0 = time.process_time()
+    for tick in range(ticks):
+        for sender in senders:
+            await sender.send(PAYLOAD, is_reliable=True)
+            await sender.send(PAYLOAD, is_reliable=False)
+        ack = pack_packet(CHAN_ACK, tick)
+        for addr, sender in zip(addrs, senders):
+            sender._process_datagram(ack, addr)
+        await asyncio.sleep(0)
+    cpu = time.process_time() - cpu0
+    for sender in senders:
+        await sender.close(timeout=0.1)
+    return cpu / ticks
+
+
+async def main(ticks: int):
+    print(f"{ticks} ticks, one reliable + one unreliable {len(PAYLOAD)}-byte update per tick")
+    print(f"{'receivers':>9}  {'send_group':>14}  {'sender/receiver':>16}")
+    for size in GROUP_SIZES:
+        addrs = [("127.0.0.1", 50000 + i) for i in range(size)]
+        group = await bench_group(addrs, ticks)
+        separate = await bench_per_receiver(addrs, ticks)
+        print(f"{size:>9}  {group * 1e6:>11.1f} us  {separate * 1e6:>13.1f} us")
+
+
+if __name__ == "__main__":
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    asyncio.run(main(ticks))
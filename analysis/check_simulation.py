@@ -0,0 +1,87 @@
+"""
+Regression run of the protocol core under the 5-40% loss profiles.
+
+Replays lossy traffic through Simulation for each loss level and checks that
+the replay finishes, that every reliable packet is acked or given up on by the
+sender, and that the reliable channel is delivered in order without
+duplicates. Exits non-zero if any profile fails.
+
+Usage: python3 analysis/check_simulation.py [duration_s] [rate_pps]
+"""
+
+import os
+import signal
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from game_net_api.simulation import LinkProfile, Simulation  # noqa: E402
+
+LOSS_PROFILES = [0.05, 0.10, 0.15, 0.20, 0.30, 0.40]
+DELAY = 0.05  # seconds
+JITTER = 0.005  # seconds
+SEED = 3103
+WALL_TIMEOUT = 120  # seconds per profile before the replay counts as stuck
+
+
+class ReplayStuck(Exception):
+    pass
+
+
+def on_alarm(signum, frame):
+    raise ReplayStuck()
+
+
+def check_profile(loss: float, duration: float, rate: float) -> list:
+    reliable_seqs = []
+
+    def deliver(packet):
+        if packet.is_reliable:
+            reliable_seqs.append(packet.seq)
+
+    sim = Simulation(LinkProfile(DELAY, JITTER, loss), seed=SEED, deliver_callback=deliver)
+    sim.add_traffic(rate, duration, is_reliable=True)
+    sim.add_traffic(rate, duration, is_reliable=False)
+
+    signal.alarm(WALL_TIMEOUT)
+    try:
+        sim.run()
+    except ReplayStuck:
+        return [f"replay stuck at t={sim.now:.3f}s"]
+    finally:
+        signal.alarm(0)
+
+    errors = []
+    if sim.sender.in_flight:
+        errors.append(f"{sim.sender.in_flight} reliable packets still in flight")
+    if any(a >= b for a, b in zip(reliable_seqs, reliable_seqs[1:])):
+        errors.append("reliable channel delivered out of order or twice")
+
+    metrics = sim.receiver.reliable_channel_metrics
+    sent = sim.sender.reliable_channel_metrics["sent_packets"]
+    if metrics["delivered_packets"] + metrics["skipped_packets"] > sent:
+        errors.append("more reliable packets delivered or skipped than sent")
+    return errors
+
+
+def main(duration: float, rate: float) -> int:
+    signal.signal(signal.SIGALRM, on_alarm)
+    failed = 0
+    for loss in LOSS_PROFILES:
+        t0 = time.perf_counter()
+        errors = check_profile(loss, duration, rate)
+        elapsed = time.perf_counter() - t0
+
+        status = "FAIL" if errors else "ok"
+        print(f"Loss {loss * 100:.0f}%: {status} ({duration:.0f}s of traffic replayed in {elapsed:.2f}s)")
+        for error in errors:
+            print(f"  {error}")
+        failed += bool(errors)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 60.0
+    rate = float(sys.argv[2]) if len(sys.argv) > 2 else 200.0
+    sys.exit(main(duration, rate))
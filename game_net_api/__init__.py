@@ -1,5 +1,19 @@
+from .blocking import BlockingGameNetReceiver, BlockingGameNetSender
+from .core import ReceiverCore, SenderCore
 from .receiver import GameNetReceiver, DeliveredDataStruct
 from .sender import GameNetSender
+from .simulation import LinkProfile, Simulation
+from .tracing import PacketTracer
 
-__all__ = ["GameNetReceiver", "GameNetSender", "DeliveredDataStruct"]
-
+__all__ = [
+    "GameNetReceiver",
+    "GameNetSender",
+    "DeliveredDataStruct",
+    "PacketTracer",
+    "SenderCore",
+    "ReceiverCore",
+    "BlockingGameNetSender",
+    "BlockingGameNetReceiver",
+    "Simulation",
+    "LinkProfile",
+]
@@ -8,6 +8,11 @@ CHAN_ACK = 2
 
 MAX_SEQ_NUM = 2**16  # 16-bit sequence number
 WINDOW_SIZE = 128  # packets
+MAX_PAYLOAD_SIZE = 1200  # bytes, keeps a packet within a typical path MTU
+
+
+def in_window(seq: int, base_seq: int) -> bool:
+    return (seq - base_seq) % MAX_SEQ_NUM < WINDOW_SIZE
 
 
 class CustomProtocol(asyncio.DatagramProtocol):
@@ -56,6 +61,3 @@ class BaseGameNetAPI:
     @abstractmethod
     def _process_datagram(self, data: bytes, addr: Tuple[str, int]):
         pass
-
-    def _in_window(self, seq: int, base_seq: int) -> bool:
-        return (seq - base_seq) % MAX_SEQ_NUM < WINDOW_SIZE
@@ -0,0 +1,166 @@
+"""
+Blocking/select-based drivers for the protocol core.
+
+These drivers own a plain non-blocking UDP socket and never start an event
+loop, so they can be called from an existing game server tick loop: call
+poll() once per tick (or whenever fileno() is readable) to process ACKs,
+deliveries and timers.
+"""
+
+import select
+import socket
+import time
+from typing import Callable, Iterable, Tuple
+
+from game_net_api.base import MAX_PAYLOAD_SIZE
+from game_net_api.core import DeliveredDataStruct, ReceiverCore, SenderCore, SenderPeersMixin
+from game_net_api.tracing import PacketTracer
+
+RECV_BUFSIZE = 65535
+
+
+class _BlockingEndpoint:
+    def __init__(self, app_name: str, core):
+        self._app_name = app_name
+        self._core = core
+        self._sock: socket.socket | None = None
+
+        self.reliable_channel_metrics = core.reliable_channel_metrics
+        self.unreliable_channel_metrics = core.unreliable_channel_metrics
+
+    @property
+    def sock(self) -> socket.socket:
+        if self._sock is None:
+            raise RuntimeError("Not started")
+
+        return self._sock
+
+    def fileno(self) -> int:
+        return self.sock.fileno()
+
+    def poll(self, timeout: float = 0.0):
+        """
+        Wait up to timeout seconds for datagrams, returning early to serve a
+        protocol timer, then process everything that is ready.
+        """
+        now = time.monotonic()
+        at = self._core.get_timer()
+        if at is not None:
+            timeout = min(timeout, max(0.0, at - now))
+
+        readable, _, _ = select.select([self.sock], [], [], timeout)
+        if readable:
+            self._read_all()
+
+        now = time.monotonic()
+        at = self._core.get_timer()
+        if at is not None and at <= now:
+            self._core.handle_timer(now)
+        self._flush_core()
+
+    def _start(self, bind_addr: Tuple[str, int]):
+        if self._sock is not None:
+            raise RuntimeError("Already started")
+
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setblocking(False)
+        sock.bind(bind_addr)
+        self._sock = sock
+        print(f"[GameNetAPI({self._app_name})] listening on {sock.getsockname()}")
+
+    def _stop(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def _read_all(self):
+        while True:
+            try:
+                data, addr = self.sock.recvfrom(RECV_BUFSIZE)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as exc:
+                # e.g. ICMP port unreachable surfaced as ConnectionRefusedError
+                print(f"[{self._app_name}] error:", exc)
+                continue
+            self._core.receive_datagram(data, addr, time.monotonic())
+
+    def _flush_core(self):
+        for data, addr in self._core.datagrams_to_send():
+            try:
+                self.sock.sendto(data, addr)
+            except (BlockingIOError, InterruptedError):
+                pass  # Socket buffer full, treat like a lost datagram
+            except OSError as exc:
+                print(f"[{self._app_name}] error:", exc)
+
+
+class BlockingGameNetSender(SenderPeersMixin, _BlockingEndpoint):
+    """Blocking driver for SenderCore, with the same API as GameNetSender minus async."""
+
+    def __init__(self, app_name: str, max_payload_size: int = MAX_PAYLOAD_SIZE, tracer: PacketTracer | None = None):
+        super().__init__(app_name, SenderCore(max_payload_size, tracer))
+        self._dest_addr = None  # default destination for send()
+
+    def connect(self, dest_addr: Tuple[str, int], bind_addr: Tuple[str, int] = None):
+        self.connect_group((dest_addr,), bind_addr)
+
+    def connect_group(self, dest_addrs: Iterable[Tuple[str, int]], bind_addr: Tuple[str, int] = None):
+        """Start the sender for fan-out to several destinations from one socket."""
+        self._add_destinations(dest_addrs)
+        addr = bind_addr if bind_addr is not None else ('0.0.0.0', 0)
+        self._start(addr)
+
+    def send(self, payload: bytes, is_reliable: bool):
+        self.send_group(payload, is_reliable, (self._dest_addr,))
+
+    def send_group(self, payload: bytes, is_reliable: bool, dest_addrs: Iterable[Tuple[str, int]] | None = None):
+        """Send one payload to several destinations, blocking while a reliable window is full."""
+        dest_addrs = self._prepare_send(payload, dest_addrs)
+        enqueued_at = time.monotonic()
+
+        # Ensure can still send to every peer, serving ACKs and timers meanwhile
+        while is_reliable and not self._core.has_room(dest_addrs):
+            self.poll(timeout=1.0)
+
+        self._core.send(payload, is_reliable, time.monotonic(), dest_addrs, enqueued_at)
+        self._flush_core()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Block until every reliable packet is acked or given up on, False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._core.in_flight > 0:
+            remaining = 1.0 if deadline is None else deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            self.poll(timeout=remaining)
+        return True
+
+    def close(self, timeout: float = 2.0):
+        if not self.flush(timeout):
+            print("[WARNING] Timeout waiting for ACKs, stopping anyway.")
+        self._stop()
+
+
+class BlockingGameNetReceiver(_BlockingEndpoint):
+    """Blocking driver for ReceiverCore, deliveries are made from within poll()."""
+
+    def __init__(self, app_name: str, tracer: PacketTracer | None = None):
+        super().__init__(app_name, ReceiverCore(tracer))
+        self._deliver_callback = None
+
+    @property
+    def clock_sync(self):
+        return self._core.clock_sync
+
+    def listenOnce(self, bind_addr: Tuple[str, int], deliver_callback: Callable[[DeliveredDataStruct], None]):
+        self._start(bind_addr)
+        self._deliver_callback = deliver_callback
+
+    def stop(self):
+        self._stop()
+
+    def _flush_core(self):
+        super()._flush_core()
+        for packet in self._core.deliveries():
+            self._deliver_callback(packet)
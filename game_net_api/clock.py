@@ -0,0 +1,95 @@
+import math
+from collections import deque
+
+from game_net_api.utils import diff_ms
+
+SYNC_FILTER_SIZE = 8  # samples kept by the clock filter
+SYNC_INTERVAL_FAST = 0.1  # seconds between sync requests until the filter is full
+SYNC_INTERVAL = 1.0  # seconds between sync requests afterwards
+DRIFT_FIT_SIZE = 64  # best samples kept for the drift fit
+MIN_DRIFT_SAMPLES = 8  # fewest best samples before drift is fitted
+MIN_DRIFT_SPAN_MS = 10_000  # shortest baseline used to estimate drift
+MAX_DRIFT_STDERR_PPM = 10.0  # drift stays 0 until its standard error is below this
+MAX_DRIFT_PPM = 200.0  # plausible bound for crystal drift, larger fits are clamped
+
+
+class ClockSync:
+    """
+    NTP-style estimate of a peer's clock relative to ours.
+
+    Each exchange yields t1 (our send), t2 (peer receive), t3 (peer send) and
+    t4 (our receive), all as 32-bit millisecond timestamps. As in NTP's clock
+    filter, the sample with the smallest round trip among the last few is
+    trusted most. Drift is a least-squares fit of offset over time through the
+    recent best samples and stays 0 until that fit is stable. The offset is read
+    off the fitted line, which is the mean of those samples while drift is 0,
+    so it is filtered over minutes rather than the last few exchanges.
+    """
+
+    def __init__(self, filter_size: int = SYNC_FILTER_SIZE):
+        self._samples = deque(maxlen=filter_size)  # (local_ms, offset_ms, rtt_ms)
+        self._best = None  # (local_ms, offset_ms, rtt_ms)
+        self._fit_points = deque(maxlen=DRIFT_FIT_SIZE)  # (local_ms, offset_ms) of successive best samples
+        self._fit_center = None  # (local_ms, offset_ms) point the fitted line goes through
+        self.drift_ppm = 0.0
+        self.rtt_ms = None  # smoothed round-trip time
+
+    @property
+    def synced(self) -> bool:
+        return self._best is not None
+
+    @property
+    def filter_full(self) -> bool:
+        return len(self._samples) == self._samples.maxlen
+
+    def add_sample(self, t1: int, t2: int, t3: int, t4: int, local_ms: int):
+        """Feed one request/reply exchange, local_ms is the full-width time of t4."""
+        rtt = diff_ms(t4, t1) - diff_ms(t3, t2)
+        if rtt < 0:
+            return  # Peer clock or timestamps are inconsistent, discard
+
+        # offset = peer clock - our clock
+        offset = (diff_ms(t2, t1) + diff_ms(t3, t4)) / 2.0
+        self._samples.append((local_ms, offset, rtt))
+        self.rtt_ms = rtt if self.rtt_ms is None else self.rtt_ms + (rtt - self.rtt_ms) / 8.0
+
+        best = min(self._samples, key=lambda sample: sample[2])
+        if best is not self._best:
+            self._fit_points.append((best[0], best[1]))
+            self._fit_drift()
+        self._best = best
+
+    def _fit_drift(self):
+        # Least-squares line of offset over local time, its slope is only kept once stable
+        points = self._fit_points
+        n = len(points)
+        mean_x = sum(x for x, _ in points) / n
+        mean_y = sum(y for _, y in points) / n
+        self._fit_center = (mean_x, mean_y)
+        self.drift_ppm = 0.0
+        if n < MIN_DRIFT_SAMPLES or points[-1][0] - points[0][0] < MIN_DRIFT_SPAN_MS:
+            return
+
+        sxx = sum((x - mean_x) ** 2 for x, _ in points)
+        sxy = sum((x - mean_x) * (y - mean_y) for x, y in points)
+        slope = sxy / sxx
+
+        residuals = sum((y - mean_y - slope * (x - mean_x)) ** 2 for x, y in points)
+        stderr = math.sqrt(residuals / (n - 2) / sxx)
+        if stderr * 1e6 > MAX_DRIFT_STDERR_PPM:
+            return
+
+        self.drift_ppm = max(-MAX_DRIFT_PPM, min(MAX_DRIFT_PPM, slope * 1e6))
+        if self.drift_ppm != slope * 1e6:
+            # A clamped slope does not pass through the points, anchor it at the newest one instead
+            self._fit_center = points[-1]
+
+    def offset_at(self, local_ms: int) -> float:
+        """Estimated peer clock minus our clock (ms) at local time local_ms."""
+        if self._fit_center is None:
+            return 0.0
+        center_local_ms, center_offset = self._fit_center
+        return center_offset + self.drift_ppm * 1e-6 * (local_ms - center_local_ms)
+
+    def sync_interval(self) -> float:
+        return SYNC_INTERVAL if self.filter_full else SYNC_INTERVAL_FAST
@@ -0,0 +1,555 @@
+"""
+I/O-free protocol core.
+
+SenderCore and ReceiverCore hold all of the reliability logic as plain state
+machines. They never touch sockets, clocks or event loops: a driver feeds them
+datagrams and the current time (in seconds, any monotonic clock), sends
+whatever datagrams_to_send() returns and calls handle_timer() once the time
+from get_timer() is reached. The asyncio, blocking and simulation drivers are
+all built on this contract.
+"""
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Tuple
+
+from game_net_api.base import (
+    CHAN_ACK,
+    CHAN_RELIABLE,
+    CHAN_UNRELIABLE,
+    MAX_PAYLOAD_SIZE,
+    MAX_SEQ_NUM,
+    WINDOW_SIZE,
+    in_window,
+)
+from game_net_api.clock import ClockSync
+from game_net_api.tracing import (
+    EV_ACK,
+    EV_BUFFERED,
+    EV_DELIVERED,
+    EV_ENQUEUE,
+    EV_RETRANSMIT,
+    EV_SEND,
+    EV_SKIPPED,
+    PacketTracer,
+)
+from game_net_api.utils import (
+    HDR_SIZE,
+    SYNC_PROBE,
+    SYNC_REPLY,
+    SYNC_REQUEST,
+    calc_latency,
+    pack_packet,
+    pack_packet_into,
+    pack_sync,
+    set_packet_seq,
+    unpack_packet,
+    unpack_sync,
+)
+from game_net_api.window import ReceiveWindow, SendWindow
+
+RETRANSMISSION_TIMEOUT = 0.1  # seconds, 100 ms
+MAX_RETRANSMISSION_COUNT = 3
+
+# For each received packet, we set a timeout to indicate the longest time
+# this received packet should stay in buffer before being delivered.
+# Only one deadline runs at a time, for the packet right behind the head-of-line gap.
+SKIP_TIMEOUT = 0.2  # seconds, 200 ms
+
+Addr = Tuple[str, int]
+
+
+def _ms(now: float) -> int:
+    return int(now * 1000)
+
+
+def _ns(now: float) -> int:
+    return int(now * 1_000_000_000)
+
+
+@dataclass
+class DeliveredDataStruct:
+    seq: int
+    is_reliable: bool
+    timestamp: int
+    latency: int  # one-way delay, corrected for the sender's clock offset once synced
+    payload: bytes
+    rtt: float | None = None  # smoothed round-trip time, None until the first time sync
+
+    def __str__(self):
+        try:
+            payload_str = self.payload.decode("utf-8")
+        except Exception:
+            payload_str = repr(self.payload)
+
+        channel_str = "Reliable" if self.is_reliable else "Unreliable"
+        rtt_str = f"{self.rtt:.1f}ms" if self.rtt is not None else "n/a"
+        return (
+            f"seq={self.seq}, channel={channel_str}, timestamp={self.timestamp}, "
+            f"latency(one-way)={self.latency}ms, RTT={rtt_str}, payload={payload_str}"
+        )
+
+
+class _Peer:
+    """Sequence and window state for one destination."""
+
+    __slots__ = ("addr", "next_reliable_seq", "next_unreliable_seq", "base_seq", "window", "scratch")
+
+    def __init__(self, addr: Addr, max_payload_size: int):
+        self.addr = addr
+        self.next_reliable_seq = 0
+        self.next_unreliable_seq = 0
+
+        # Additional states for reliable channel
+        self.base_seq = 0  # smallest unacked seq in window
+        self.window = SendWindow(WINDOW_SIZE, max_payload_size)
+        self.scratch = bytearray(HDR_SIZE + max_payload_size)  # outgoing unreliable packet
+
+    def has_room(self) -> bool:
+        return (self.next_reliable_seq - self.base_seq) % MAX_SEQ_NUM < WINDOW_SIZE
+
+
+class SenderCore:
+    """
+    Sender state machine: per-destination sequence numbers, reliable windows and
+    retransmission deadlines. Views returned by datagrams_to_send() point into
+    preallocated buffers and are only valid until the next call into the core.
+    """
+
+    def __init__(self, max_payload_size: int = MAX_PAYLOAD_SIZE, tracer: PacketTracer | None = None):
+        self._tracer = tracer  # optional packet lifecycle tracing, follows the default destination only
+        self.default_addr: Addr | None = None
+        self._max_payload_size = max_payload_size
+        self._peers: Dict[Addr, _Peer] = {}
+        self._outbox: List[Tuple[memoryview | bytes, Addr]] = []
+
+        # Retransmission deadlines in the order they were set, every in-flight
+        # packet has exactly one live entry. Entries for packets acked meanwhile
+        # are dropped lazily.
+        self._deadlines = deque()  # (deadline, peer, seq)
+
+        # Metrics
+        self.reliable_channel_metrics = { "sent_packets": 0, "retransmissions": 0, "rtt_ms": 0.0 }
+        self.unreliable_channel_metrics = { "sent_packets": 0, "restransmissions": 0 }
+
+    def add_peer(self, addr: Addr):
+        if self.default_addr is None:
+            self.default_addr = addr
+        if addr not in self._peers:
+            self._peers[addr] = _Peer(addr, self._max_payload_size)
+
+    @property
+    def peers(self) -> List[Addr]:
+        return list(self._peers)
+
+    @property
+    def in_flight(self) -> int:
+        """Reliable packets not yet acked or given up on, over all peers."""
+        return sum(peer.window.in_flight for peer in self._peers.values())
+
+    def peer_window(self, addr: Addr) -> SendWindow:
+        return self._peers[addr].window
+
+    def check_payload(self, payload: bytes):
+        if len(payload) > self._max_payload_size:
+            raise ValueError(f"Payload too large ({len(payload)} > {self._max_payload_size} bytes)")
+
+    def has_room(self, dest_addrs: Iterable[Addr] | None = None) -> bool:
+        """Whether a reliable packet can be sent to every given destination right now."""
+        return all(peer.has_room() for peer in self._select(dest_addrs))
+
+    def send(
+        self,
+        payload: bytes,
+        is_reliable: bool,
+        now: float,
+        dest_addrs: Iterable[Addr] | None = None,
+        enqueued_at: float | None = None,
+    ):
+        """
+        Send one payload to several destinations (all peers by default). The
+        packet is built once and only the per-peer seq in its header is rewritten.
+        A reliable send requires has_room() for the same destinations.
+        """
+        self.check_payload(payload)
+        peers = self._select(dest_addrs)
+        if not peers:
+            return
+        if is_reliable:
+            if not all(peer.has_room() for peer in peers):
+                raise RuntimeError("Sender window full")
+            self._send_reliable(payload, peers, now, now if enqueued_at is None else enqueued_at)
+        else:
+            self._send_unreliable(payload, peers, now)
+
+    def receive_datagram(self, data: bytes, addr: Addr, now: float):
+        """Process ACKs (and time-sync requests) from a receiver."""
+        peer = self._peers.get(addr)
+        if peer is None:
+            print(f"[WARNING] Data received from {addr} which is not a destination of this sender")
+            return
+
+        try:
+            channel, seq, timestamp, payload = unpack_packet(data)
+        except Exception as e:
+            print(f"[ServerProtocol] bad pkt from {addr}: {e}")
+            return
+
+        if channel != CHAN_ACK:
+            print(f"[WARNING] Non-ACK packet received from {addr} on Sender")
+            return  # Ignore non-ACK packets
+
+        if payload and self._handle_sync_request(peer, seq, timestamp, payload, now) == SYNC_PROBE:
+            return  # Standalone sync request, not an ACK
+
+        if not in_window(seq, peer.base_seq):
+            return  # Ignore ACKs outside the window
+
+        if peer.window.acked[seq % WINDOW_SIZE]:
+            return  # Ignore duplicate ACKs
+
+        self._update_rtt(peer, seq, now)
+        peer.window.release(seq)
+        if self._tracer is not None and addr == self.default_addr:
+            self._tracer.record(EV_ACK, CHAN_RELIABLE, seq, _ns(now))
+
+        self._try_advance_base(peer)
+
+    def get_timer(self) -> float | None:
+        """Time of the next retransmission deadline, None if nothing is in flight."""
+        while self._deadlines:
+            _, peer, seq = self._deadlines[0]
+            if peer.window.is_pending(seq):
+                return self._deadlines[0][0]
+            self._deadlines.popleft()
+        return None
+
+    def handle_timer(self, now: float):
+        while self._deadlines and self._deadlines[0][0] <= now:
+            _, peer, seq = self._deadlines.popleft()
+            if not peer.window.is_pending(seq):
+                continue  # Acked or given up on since the deadline was set
+
+            # If retransmitted more than max count
+            if peer.window.retries[seq % WINDOW_SIZE] > MAX_RETRANSMISSION_COUNT:
+                # If packet not reached max retrans count, we assume do not care about this packet anymore
+                peer.window.release(seq)
+                self._try_advance_base(peer)
+                continue
+
+            # Retransmit straight from the window slot
+            self._outbox.append((peer.window.packet(seq), peer.addr))
+            peer.window.retries[seq % WINDOW_SIZE] += 1
+            self.reliable_channel_metrics["retransmissions"] += 1
+            if self._tracer is not None and peer.addr == self.default_addr:
+                self._tracer.record(EV_RETRANSMIT, CHAN_RELIABLE, seq, _ns(now))
+
+            # Restart timer
+            self._deadlines.append((now + RETRANSMISSION_TIMEOUT, peer, seq))
+
+    def datagrams_to_send(self) -> List[Tuple[memoryview | bytes, Addr]]:
+        datagrams, self._outbox = self._outbox, []
+        return datagrams
+
+    def _select(self, dest_addrs: Iterable[Addr] | None) -> List[_Peer]:
+        if dest_addrs is None:
+            return list(self._peers.values())
+
+        # Each destination once, a duplicate would reuse a window slot or buffer still in use
+        peers = []
+        for addr in dict.fromkeys(dest_addrs):
+            peer = self._peers.get(addr)
+            if peer is None:
+                raise ValueError(f"{addr} is not a destination of this sender, add it with add_peer() first")
+            peers.append(peer)
+        return peers
+
+    def _handle_sync_request(self, peer: _Peer, seq: int, request_timestamp: int, payload: bytes, now: float) -> int | None:
+        # Echo the receiver's timestamp with our receive time, our send time goes in the header
+        try:
+            kind, _, _ = unpack_sync(payload)
+        except ValueError as e:
+            print(f"[ServerProtocol] bad sync payload from {peer.addr}: {e}")
+            return None
+
+        if kind in (SYNC_REQUEST, SYNC_PROBE):
+            reply = pack_sync(SYNC_REPLY, request_timestamp, _ms(now))
+            self._outbox.append((pack_packet(CHAN_ACK, seq, reply, _ms(now)), peer.addr))
+        return kind
+
+    def _send_unreliable(self, payload: bytes, peers: List[_Peer], now: float):
+        # Build packet once in the first peer's buffer
+        length = pack_packet_into(peers[0].scratch, 0, CHAN_UNRELIABLE, peers[0].next_unreliable_seq, payload, _ms(now))
+        built = memoryview(peers[0].scratch)[:length]
+
+        # Send data, copying it only for further peers and patching their seq
+        for peer in peers:
+            seq = peer.next_unreliable_seq
+            if peer is not peers[0]:
+                peer.scratch[:length] = built
+                set_packet_seq(peer.scratch, 0, seq)
+            self._outbox.append((memoryview(peer.scratch)[:length], peer.addr))
+            if self._tracer is not None and peer.addr == self.default_addr:
+                self._tracer.record(EV_ENQUEUE, CHAN_UNRELIABLE, seq, _ns(now))
+                self._tracer.record(EV_SEND, CHAN_UNRELIABLE, seq, _ns(now))
+
+            # Update state
+            peer.next_unreliable_seq = (seq + 1) % MAX_SEQ_NUM
+        self.unreliable_channel_metrics["sent_packets"] += len(peers)
+
+    def _send_reliable(self, payload: bytes, peers: List[_Peer], now: float, enqueued_at: float):
+        # Build packet once in the first peer's window slot
+        sent_at = _ms(now)
+        built = peers[0].window.store(peers[0].next_reliable_seq, payload, sent_at)
+
+        # Send data, copying it only into further peers' slots and patching their seq
+        for peer in peers:
+            seq = peer.next_reliable_seq
+            assert not peer.window.acked[seq % WINDOW_SIZE], "ACK state invalid before send"
+            packet = built if peer is peers[0] else peer.window.store_copy(seq, built, sent_at)
+            self._outbox.append((packet, peer.addr))
+            self._deadlines.append((now + RETRANSMISSION_TIMEOUT, peer, seq))
+            if self._tracer is not None and peer.addr == self.default_addr:
+                self._tracer.record(EV_ENQUEUE, CHAN_RELIABLE, seq, _ns(enqueued_at))
+                self._tracer.record(EV_SEND, CHAN_RELIABLE, seq, _ns(now))
+
+            # Update state
+            peer.next_reliable_seq = (seq + 1) % MAX_SEQ_NUM
+        self.reliable_channel_metrics["sent_packets"] += len(peers)
+
+    def _update_rtt(self, peer: _Peer, seq: int, now: float):
+        # Only packets never retransmitted give an unambiguous sample (Karn's algorithm)
+        if peer.window.retries[seq % WINDOW_SIZE]:
+            return
+
+        rtt = _ms(now) - peer.window.sent_at[seq % WINDOW_SIZE]
+        metrics = self.reliable_channel_metrics
+        metrics["rtt_ms"] = rtt if metrics["rtt_ms"] == 0.0 else metrics["rtt_ms"] + (rtt - metrics["rtt_ms"]) / 8.0
+
+    def _try_advance_base(self, peer: _Peer):
+        while peer.window.acked[peer.base_seq % WINDOW_SIZE]:
+            peer.window.acked[peer.base_seq % WINDOW_SIZE] = 0
+            peer.base_seq = (peer.base_seq + 1) % MAX_SEQ_NUM
+
+
+class SenderPeersMixin:
+    """
+    Destination handling shared by the sender drivers, on top of a SenderCore
+    in self._core. Only the waiting differs between drivers.
+    """
+
+    _core: SenderCore
+    _dest_addr: Addr | None  # default destination for send()
+
+    def add_peer(self, dest_addr: Addr):
+        self._core.add_peer(dest_addr)
+
+    @property
+    def peers(self) -> List[Addr]:
+        return self._core.peers
+
+    def _add_destinations(self, dest_addrs: Iterable[Addr]):
+        # Destinations of connect()/connect_group(), the first one is the default
+        dest_addrs = list(dest_addrs)
+        if not dest_addrs:
+            raise ValueError("No destination given")
+
+        self._dest_addr = dest_addrs[0]
+        for dest_addr in dest_addrs:
+            self.add_peer(dest_addr)
+
+    def _prepare_send(self, payload: bytes, dest_addrs: Iterable[Addr] | None) -> List[Addr] | None:
+        # Validate a send before waiting for room, returns the destinations (None for all peers)
+        self._core.check_payload(payload)
+        return None if dest_addrs is None else list(dest_addrs)
+
+
+class ReceiverCore:
+    """
+    Receiver state machine: reorder window, skip deadline, ACKs and clock sync
+    for a single sender. Delivered packets are collected and handed out by
+    deliveries(), ACKs by datagrams_to_send().
+    """
+
+    def __init__(self, tracer: PacketTracer | None = None):
+        self._tracer = tracer  # optional packet lifecycle tracing
+        self.src_addr: Addr | None = None
+        self._outbox: List[Tuple[bytes, Addr]] = []
+        self._delivered: List[DeliveredDataStruct] = []
+
+        # Additional states for reliable channel
+        self._window = ReceiveWindow(WINDOW_SIZE)
+        self._skip_deadline: float | None = None  # deadline for the head-of-line gap
+
+        # Clock sync with the sender, piggybacked on ACKs of the reliable channel
+        # or sent on its own from a deadline while no reliable ACK carries one
+        self.clock_sync = ClockSync()
+        self._next_sync_at: float | None = None
+        self._sync_deadline: float | None = None
+
+        # Metrics
+        self.reliable_channel_metrics = {
+            "delivered_packets": 0,
+            "received_bytes": 0,
+            "latency_sum_ms": 0.0,
+            "latency_min_ms": float("inf"),
+            "latency_max_ms": 0.0,
+            "jitter_ms": 0.0,
+            "rtt_ms": 0.0,
+            "skipped_packets": 0,
+        }
+        self.unreliable_channel_metrics = {
+            "delivered_packets": 0,
+            "received_bytes": 0,
+            "latency_sum_ms": 0.0,
+            "latency_min_ms": float("inf"),
+            "latency_max_ms": 0.0,
+            "jitter_ms": 0.0,
+            "rtt_ms": 0.0,
+        }
+
+    # Assume that only accept connection from single sender
+    def receive_datagram(self, data: bytes, addr: Addr, now: float):
+        if self.src_addr is None:
+            self.src_addr = addr
+
+        if addr != self.src_addr:
+            print(f"[WARNING] Data received from {addr} when src_addr is {self.src_addr}, the server only accepts listening to single source.")
+            return
+
+        try:
+            channel, seq, sent_timestamp, payload = unpack_packet(data)
+        except Exception as e:
+            print(f"[ServerProtocol] bad pkt from {addr}: {e}")
+            return
+
+        if channel == CHAN_UNRELIABLE:
+            self._deliver_to_application(channel, seq, sent_timestamp, payload, now) # Deliver directly
+        elif channel == CHAN_RELIABLE:
+            self._handle_reliable(seq, sent_timestamp, payload, now)
+        elif channel == CHAN_ACK:
+            if payload:
+                self._handle_sync_reply(sent_timestamp, payload, now)
+            else:
+                print(f"[WARNING] ACK packet received from {addr} on Receiver")
+            return
+
+        # Make sure a sync request goes out even if no reliable ACK carries one
+        if self._sync_deadline is None:
+            self._sync_deadline = now if self._next_sync_at is None else max(now, self._next_sync_at)
+
+    def get_timer(self) -> float | None:
+        deadlines = [at for at in (self._skip_deadline, self._sync_deadline) if at is not None]
+        return min(deadlines) if deadlines else None
+
+    def handle_timer(self, now: float):
+        if self._sync_deadline is not None and now >= self._sync_deadline:
+            self._sync_deadline = None
+            if self._sync_due(now):
+                self._outbox.append((pack_packet(CHAN_ACK, 0, pack_sync(SYNC_PROBE), _ms(now)), self.src_addr))
+
+        if self._skip_deadline is None or now < self._skip_deadline:
+            return
+        self._skip_deadline = None
+
+        # Skip lost packets before every packet buffered for longer than SKIP_TIMEOUT
+        for skipped_seq in self._window.skip_expired(now, SKIP_TIMEOUT):
+            self._outbox.append((pack_packet(CHAN_ACK, skipped_seq, None, _ms(now)), self.src_addr))
+            if self._tracer is not None:
+                self._tracer.record(EV_SKIPPED, CHAN_RELIABLE, skipped_seq, _ns(now))
+
+        self._try_deliver_reliable(now)
+
+    def datagrams_to_send(self) -> List[Tuple[bytes, Addr]]:
+        datagrams, self._outbox = self._outbox, []
+        return datagrams
+
+    def deliveries(self) -> List[DeliveredDataStruct]:
+        delivered, self._delivered = self._delivered, []
+        return delivered
+
+    def _handle_reliable(self, seq: int, sent_timestamp: int, payload: bytes, now: float):
+        base_seq = self._window.base_seq
+
+        # If seq outside window [base_seq - WINDOW_SIZE, base_seq + WINDOW_SIZE), ignore
+        if not in_window(seq, base_seq) and not in_window(seq, (base_seq - WINDOW_SIZE) % MAX_SEQ_NUM):
+            return
+
+        # If within window, immediately send ACK, every so often carrying a time-sync request
+        sync = pack_sync(SYNC_REQUEST) if self._sync_due(now) else None
+        self._outbox.append((pack_packet(CHAN_ACK, seq, sync, _ms(now)), self.src_addr))
+
+        # Ignore duplicate packet, otherwise buffer it
+        if not in_window(seq, base_seq) or not self._window.store(seq, (seq, sent_timestamp, payload), now):
+            return
+        if self._tracer is not None:
+            self._tracer.record(EV_BUFFERED, CHAN_RELIABLE, seq, _ns(now))
+
+        self._try_deliver_reliable(now)
+
+    def _try_deliver_reliable(self, now: float):
+        ready = self._window.pop_ready()
+        for buf in ready:
+            if buf is not None:
+                seq, sent_timestamp, payload = buf
+                self._deliver_to_application(CHAN_RELIABLE, seq, sent_timestamp, payload, now)
+            else:
+                self.reliable_channel_metrics["skipped_packets"] += 1
+
+        # If packets are still waiting out of order, make sure a skip deadline is set.
+        # The oldest waiting packet only changes when the head of the window moves.
+        if not self._window.has_gap():
+            self._skip_deadline = None
+        elif self._skip_deadline is None or ready:
+            self._skip_deadline = self._window.oldest_arrival() + SKIP_TIMEOUT
+
+    def _sync_due(self, now: float) -> bool:
+        # A request is due once per sync interval, whichever packet carries it
+        if self._next_sync_at is not None and now < self._next_sync_at:
+            return False
+        self._next_sync_at = now + self.clock_sync.sync_interval()
+        return True
+
+    def _handle_sync_reply(self, reply_timestamp: int, payload: bytes, now: float):
+        received_ms = _ms(now)
+        try:
+            kind, request_timestamp, peer_received_timestamp = unpack_sync(payload)
+        except ValueError as e:
+            print(f"[ServerProtocol] bad sync payload from {self.src_addr}: {e}")
+            return
+
+        if kind == SYNC_REPLY:
+            self.clock_sync.add_sample(
+                request_timestamp, peer_received_timestamp, reply_timestamp, received_ms, received_ms
+            )
+
+    def _deliver_to_application(self, channel: int, seq: int, sent_timestamp: int, payload: bytes, now: float):
+        delivered_ms = _ms(now)
+        latency = calc_latency(sent_timestamp, delivered_ms, self.clock_sync.offset_at(delivered_ms))
+        rtt = self.clock_sync.rtt_ms
+        if self._tracer is not None:
+            self._tracer.record(EV_DELIVERED, channel, seq, _ns(now))
+        self._delivered.append(DeliveredDataStruct(seq, channel == CHAN_RELIABLE, sent_timestamp, latency, payload, rtt))
+        self._update_metrics(channel, latency, payload)
+
+    def _update_metrics(self, channel: int, latency: int, payload: bytes):
+        metrics = self.reliable_channel_metrics if channel == CHAN_RELIABLE else self.unreliable_channel_metrics
+
+        if "prev_transit_ms" not in metrics:
+            metrics["prev_transit_ms"] = latency
+
+        # RFC 3550 jitter calculation (https://datatracker.ietf.org/doc/html/rfc3550#appendix-A.8)
+        D = latency - metrics["prev_transit_ms"]
+        metrics["prev_transit_ms"] = latency
+        metrics["jitter_ms"] += (abs(D) - metrics["jitter_ms"]) / 16.0
+
+        # Update latency stats
+        metrics["latency_sum_ms"] += latency
+        metrics["latency_min_ms"] = min(metrics["latency_min_ms"], latency)
+        metrics["latency_max_ms"] = max(metrics["latency_max_ms"], latency)
+        if self.clock_sync.rtt_ms is not None:
+            metrics["rtt_ms"] = self.clock_sync.rtt_ms
+
+        # Packet and byte counters
+        metrics["delivered_packets"] += 1
+        metrics["received_bytes"] += len(payload)
@@ -0,0 +1,205 @@
+import json
+import time
+from array import array
+from typing import Dict, Iterator, List, Tuple
+
+from game_net_api.base import CHAN_RELIABLE, CHAN_UNRELIABLE
+
+# Packet lifecycle events
+EV_ENQUEUE = 0  # send() called by the application
+EV_SEND = 1  # first transmission, after any wait for the sender window
+EV_RETRANSMIT = 2
+EV_ACK = 3  # ACK processed by the sender
+EV_BUFFERED = 4  # reliable packet accepted into the receive window
+EV_DELIVERED = 5  # handed to the application callback
+EV_SKIPPED = 6  # receiver gave up waiting for the packet
+
+EVENT_NAMES = ["enqueue", "send", "retransmit", "ack", "buffered", "delivered", "skipped"]
+CHANNEL_NAMES = {CHAN_UNRELIABLE: "unreliable", CHAN_RELIABLE: "reliable"}
+
+TRACE_CAPACITY = 1 << 16  # events kept per tracer
+
+
+class PacketTracer:
+    """
+    Opt-in recorder for packet lifecycle events.
+
+    Events go into a preallocated ring buffer, so tracing never allocates per
+    packet and only the latest `capacity` events are kept. Sampling is done per
+    sequence number (every `sample_every`-th seq) so that each sampled packet
+    keeps its full lifecycle on both the sender and the receiver.
+    """
+
+    __slots__ = ("name", "capacity", "sample_every", "_count", "_ts", "_event", "_channel", "_seq")
+
+    def __init__(self, name: str, capacity: int = TRACE_CAPACITY, sample_every: int = 1):
+        self.name = name
+        self.capacity = capacity
+        self.sample_every = sample_every
+        self._count = 0
+        self._ts = array("q", [0]) * capacity  # monotonic ns
+        self._event = array("B", [0]) * capacity
+        self._channel = array("B", [0]) * capacity
+        self._seq = array("H", [0]) * capacity
+
+    def record(self, event: int, channel: int, seq: int, ts_ns: int | None = None):
+        if seq % self.sample_every:
+            return
+
+        idx = self._count % self.capacity
+        self._ts[idx] = time.monotonic_ns() if ts_ns is None else ts_ns
+        self._event[idx] = event
+        self._channel[idx] = channel
+        self._seq[idx] = seq
+        self._count += 1
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    def events(self) -> Iterator[Tuple[int, int, int, int]]:
+        """Yield (ts_ns, event, channel, seq) from oldest to newest."""
+        start = self._count - len(self)
+        for i in range(start, self._count):
+            idx = i % self.capacity
+            yield self._ts[idx], self._event[idx], self._channel[idx], self._seq[idx]
+
+
+def _lifecycles(tracers) -> List[Dict[int, List[int]]]:
+    """
+    Join events from all tracers into per-packet lifecycles, each a dict of
+    event -> timestamps. A new lifecycle starts at every enqueue, so sequence
+    numbers reused after wrap-around are kept apart.
+    """
+    merged = sorted(event for tracer in tracers for event in tracer.events())
+    current: Dict[Tuple[int, int], Dict[int, List[int]]] = {}
+    packets = []
+    for ts, event, channel, seq in merged:
+        key = (channel, seq)
+        if event == EV_ENQUEUE or key not in current:
+            current[key] = {"channel": channel, "seq": seq}
+            packets.append(current[key])
+        current[key].setdefault(event, []).append(ts)
+    return packets
+
+
+def _components(packet: Dict) -> Dict[str, float]:
+    """Split one packet's end-to-end latency into components (ms)."""
+    ms = 1e-6
+    parts = {}
+    enqueue, send = packet.get(EV_ENQUEUE), packet.get(EV_SEND)
+    if enqueue and send:
+        parts["send_queue"] = (send[0] - enqueue[0]) * ms
+
+    arrived = packet.get(EV_BUFFERED, packet.get(EV_DELIVERED))
+    if send and arrived:
+        # The copy that got through is assumed to be the last one sent before arrival
+        retransmits = [ts for ts in packet.get(EV_RETRANSMIT, []) if ts <= arrived[0]]
+        last_tx = retransmits[-1] if retransmits else send[0]
+        parts["retransmission"] = (last_tx - send[0]) * ms
+        parts["network"] = (arrived[0] - last_tx) * ms
+
+    buffered, delivered = packet.get(EV_BUFFERED), packet.get(EV_DELIVERED)
+    if buffered and delivered:
+        parts["head_of_line"] = (delivered[0] - buffered[0]) * ms
+
+    if enqueue and delivered:
+        parts["total"] = (delivered[0] - enqueue[0]) * ms
+    return parts
+
+
+def _stats(values: List[float]) -> Dict[str, float]:
+    values = sorted(values)
+    n = len(values)
+    return {
+        "count": n,
+        "mean_ms": sum(values) / n,
+        "p50_ms": values[n // 2],
+        "p99_ms": values[min(n - 1, int(n * 0.99))],
+        "max_ms": values[-1],
+    }
+
+
+def summarize(*tracers: PacketTracer) -> Dict[str, Dict]:
+    """
+    Break down per-packet latency by component for each channel, joining the
+    events of the given tracers (e.g. one for the sender and one for the
+    receiver, which must share a clock).
+    """
+    summary = {}
+    for channel, channel_name in CHANNEL_NAMES.items():
+        packets = [p for p in _lifecycles(tracers) if p["channel"] == channel]
+        if not packets:
+            continue
+
+        components: Dict[str, List[float]] = {}
+        for packet in packets:
+            for name, value in _components(packet).items():
+                components.setdefault(name, []).append(value)
+
+        summary[channel_name] = {
+            "packets": len(packets),
+            "retransmissions": sum(len(p.get(EV_RETRANSMIT, [])) for p in packets),
+            "skipped": sum(1 for p in packets if EV_SKIPPED in p),
+            "components": {name: _stats(values) for name, values in components.items()},
+        }
+    return summary
+
+
+def format_summary(summary: Dict[str, Dict]) -> str:
+    lines = []
+    for channel_name, channel in summary.items():
+        lines.append(
+            f"{channel_name}: {channel['packets']} traced packets, "
+            f"{channel['retransmissions']} retransmissions, {channel['skipped']} skipped"
+        )
+        for name, s in channel["components"].items():
+            lines.append(
+                f"  {name:<15} mean={s['mean_ms']:8.2f}ms  p50={s['p50_ms']:8.2f}ms  "
+                f"p99={s['p99_ms']:8.2f}ms  max={s['max_ms']:8.2f}ms  (n={s['count']})"
+            )
+    return "\n".join(lines)
+
+
+def export_chrome_trace(path: str, *tracers: PacketTracer):
+    """
+    Write the events as Chrome/Perfetto trace JSON. Each tracer becomes a
+    process with one track per channel, and every joined packet gets an async
+    slice of its own under a "packets" process, split into one nested slice per
+    latency component. Packets in flight at the same time thus never overlap
+    on a shared track.
+    """
+    trace_events = []
+    for pid, tracer in enumerate(tracers):
+        trace_events.append({"ph": "M", "name": "process_name", "pid": pid, "args": {"name": tracer.name}})
+        for channel, channel_name in CHANNEL_NAMES.items():
+            trace_events.append(
+                {"ph": "M", "name": "thread_name", "pid": pid, "tid": channel, "args": {"name": channel_name}}
+            )
+        for ts, event, channel, seq in tracer.events():
+            trace_events.append({
+                "ph": "i", "s": "t", "name": EVENT_NAMES[event], "pid": pid, "tid": channel,
+                "ts": ts / 1000, "args": {"seq": seq},
+            })
+
+    # Component slices, laid out back to back from the enqueue time, one async id per lifecycle
+    packets_pid = len(tracers)
+    trace_events.append({"ph": "M", "name": "process_name", "pid": packets_pid, "args": {"name": "packets"}})
+    for lifecycle_id, packet in enumerate(_lifecycles(tracers)):
+        if EV_ENQUEUE not in packet:
+            continue
+        channel_name = CHANNEL_NAMES[packet["channel"]]
+        common = {"cat": channel_name, "id": lifecycle_id, "pid": packets_pid, "tid": packet["channel"]}
+        ts_us = packet[EV_ENQUEUE][0] / 1000
+        args = {"seq": packet["seq"]}
+
+        trace_events.append({"ph": "b", "name": f"{channel_name} seq={packet['seq']}", "ts": ts_us, "args": args, **common})
+        for name, value in _components(packet).items():
+            if name == "total":
+                continue
+            trace_events.append({"ph": "b", "name": name, "ts": ts_us, "args": args, **common})
+            ts_us += value * 1000
+            trace_events.append({"ph": "e", "name": name, "ts": ts_us, **common})
+        trace_events.append({"ph": "e", "name": f"{channel_name} seq={packet['seq']}", "ts": ts_us, **common})
+
+    with open(path, "w") as f:
+        json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, f)
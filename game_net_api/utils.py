@@ -4,32 +4,83 @@ from typing import Tuple
 
 HDR_FMT = "!B H I"  # channel(1), seq(2), timestamp(4)
 HDR_SIZE = struct.calcsize(HDR_FMT)
+SEQ_FMT = "!H"
+SEQ_OFFSET = 1  # seq follows the 1-byte channel in the header
+
+# Time-sync payload carried on ACK channel packets: kind(1), t1(4), t2(4)
+SYNC_FMT = "!B I I"
+SYNC_SIZE = struct.calcsize(SYNC_FMT)
+SYNC_REQUEST = 1  # piggybacked on the ACK of a reliable packet
+SYNC_REPLY = 2
+SYNC_PROBE = 3  # request sent on its own, acknowledges no packet
 
 
 def now_ms() -> int:
     return int(time.monotonic_ns() / 1_000_000)
 
-def calc_latency(sent_timestamp: int, delivered_timestamp: int) -> int:
+def diff_ms(a: int, b: int) -> int:
+    """
+    Signed difference a - b of two 32-bit millisecond timestamps.
+    """
+    # Interpret the difference modulo 2**32 as a signed 32-bit value so
+    # wrap-around between the two timestamps does not produce huge values.
+    d = ((a & 0xFFFFFFFF) - (b & 0xFFFFFFFF)) & 0xFFFFFFFF
+    return d - 0x100000000 if d & 0x80000000 else d
+
+
+def calc_latency(sent_timestamp: int, delivered_timestamp: int, offset_ms: float = 0.0) -> int:
     """
     Calculate latency in milliseconds.
     Assume only lower 32 bits of timestamps are considered.
+    offset_ms is the sender's clock minus the receiver's clock, 0 when both share a host.
     """
-    # Use unsigned 32-bit modulo arithmetic to account for 32-bit wrap-around
-    # e.g., when the sender's lower-32-bit timestamp wraps from 0xFFFFFFFF -> 0x00000000
-    # compute the difference modulo 2**32 so the result is a non-negative latency value.
-    sent = sent_timestamp & 0xFFFFFFFF
-    delivered = delivered_timestamp & 0xFFFFFFFF
-    return (delivered - sent) & 0xFFFFFFFF
+    # Use 32-bit modulo arithmetic to account for 32-bit wrap-around
+    # e.g., when the sender's lower-32-bit timestamp wraps from 0xFFFFFFFF -> 0x00000000.
+    # Estimation error in offset_ms can push the result slightly below zero, clamp it.
+    return max(0, round(diff_ms(delivered_timestamp, sent_timestamp) + offset_ms))
 
 
-def pack_packet(channel: int, seq: int, payload: bytes | None = None) -> bytes:
-    timestamp = now_ms()
+def pack_packet(channel: int, seq: int, payload: bytes | None = None, timestamp: int | None = None) -> bytes:
+    if timestamp is None:
+        timestamp = now_ms()
     header = struct.pack(HDR_FMT, channel & 0xFF, seq & 0xFFFF, timestamp & 0xFFFFFFFF)
     if not payload:
         return header
     return header + payload
 
 
+def pack_packet_into(
+    buffer: bytearray, offset: int, channel: int, seq: int, payload: bytes | None = None, timestamp: int | None = None
+) -> int:
+    """
+    Pack a packet directly into a preallocated buffer at offset.
+    Returns the number of bytes written.
+    """
+    if timestamp is None:
+        timestamp = now_ms()
+    struct.pack_into(HDR_FMT, buffer, offset, channel & 0xFF, seq & 0xFFFF, timestamp & 0xFFFFFFFF)
+    end = offset + HDR_SIZE
+    if payload:
+        buffer[end:end + len(payload)] = payload
+        end += len(payload)
+    return end - offset
+
+
+def set_packet_seq(buffer: bytearray, offset: int, seq: int):
+    """Overwrite the seq of a packet already packed into buffer at offset."""
+    struct.pack_into(SEQ_FMT, buffer, offset + SEQ_OFFSET, seq & 0xFFFF)
+
+
+def pack_sync(kind: int, t1: int = 0, t2: int = 0) -> bytes:
+    return struct.pack(SYNC_FMT, kind & 0xFF, t1 & 0xFFFFFFFF, t2 & 0xFFFFFFFF)
+
+
+def unpack_sync(payload: bytes) -> Tuple[int, int, int]:
+    if len(payload) != SYNC_SIZE:
+        raise ValueError("Bad sync payload")
+    return struct.unpack(SYNC_FMT, payload)
+
+
 def unpack_packet(data: bytes) -> Tuple[int, int, int, bytes]:
     if len(data) < HDR_SIZE:
         raise ValueError("Data too short")
@@ -0,0 +1,192 @@
+from array import array
+from typing import List, Tuple
+
+from game_net_api.base import CHAN_RELIABLE, MAX_PAYLOAD_SIZE, MAX_SEQ_NUM, WINDOW_SIZE
+from game_net_api.utils import HDR_SIZE, pack_packet_into, set_packet_seq
+
+
+class SendWindow:
+    """
+    Fixed-size store for in-flight reliable packets.
+
+    Every window slot owns a region of one preallocated slab, packets are packed
+    into it in place and read back as memoryview slices for (re)transmission.
+    Per-slot state lives in flat arrays, so the memory used by a connection does
+    not depend on the send rate.
+    """
+
+    __slots__ = ("size", "slot_size", "_slab", "_view", "seqs", "lengths", "acked", "retries", "sent_at", "in_flight")
+
+    def __init__(self, size: int = WINDOW_SIZE, max_payload_size: int = MAX_PAYLOAD_SIZE):
+        self.size = size
+        self.slot_size = HDR_SIZE + max_payload_size
+        self._slab = bytearray(size * self.slot_size)
+        self._view = memoryview(self._slab)
+
+        self.seqs = array("H", [0]) * size  # seq currently held by the slot
+        self.lengths = array("H", [0]) * size  # packet length, 0 if slot is free
+        self.acked = array("B", [0]) * size  # acked flags for packets in window
+        self.retries = array("B", [0]) * size  # retransmissions done so far
+        self.sent_at = array("q", [0]) * size  # first send time (ms), negative on a simulated clock offset below 0
+        self.in_flight = 0  # number of pending slots
+
+    @property
+    def max_payload_size(self) -> int:
+        return self.slot_size - HDR_SIZE
+
+    def store(self, seq: int, payload: bytes, sent_at: int) -> memoryview:
+        """
+        Pack a reliable packet into the slot for seq and return a view of it.
+        sent_at also goes into the header as the packet timestamp.
+        """
+        if len(payload) > self.max_payload_size:
+            raise ValueError(f"Payload too large ({len(payload)} > {self.max_payload_size} bytes)")
+
+        idx = seq % self.size
+        offset = idx * self.slot_size
+        length = pack_packet_into(self._slab, offset, CHAN_RELIABLE, seq, payload, sent_at)
+        return self._occupy(idx, seq, length, sent_at)
+
+    def store_copy(self, seq: int, packet: memoryview, sent_at: int) -> memoryview:
+        """
+        Copy a reliable packet already packed elsewhere into the slot for seq,
+        rewriting its header seq, and return a view of it. Used to fan one
+        packet out to further destinations.
+        """
+        if len(packet) > self.slot_size:
+            raise ValueError(f"Packet too large ({len(packet)} > {self.slot_size} bytes)")
+
+        idx = seq % self.size
+        offset = idx * self.slot_size
+        length = len(packet)
+        self._slab[offset:offset + length] = packet
+        set_packet_seq(self._slab, offset, seq)
+        return self._occupy(idx, seq, length, sent_at)
+
+    def _occupy(self, idx: int, seq: int, length: int, sent_at: int) -> memoryview:
+        if self.lengths[idx] == 0:
+            self.in_flight += 1
+        self.seqs[idx] = seq
+        self.lengths[idx] = length
+        self.retries[idx] = 0
+        self.sent_at[idx] = sent_at
+        offset = idx * self.slot_size
+        return self._view[offset:offset + length]
+
+    def packet(self, seq: int) -> memoryview:
+        idx = seq % self.size
+        offset = idx * self.slot_size
+        return self._view[offset:offset + self.lengths[idx]]
+
+    def is_pending(self, seq: int) -> bool:
+        idx = seq % self.size
+        return self.lengths[idx] != 0 and self.seqs[idx] == seq
+
+    def release(self, seq: int):
+        """Mark the packet for seq as done (acked or given up on)."""
+        idx = seq % self.size
+        if self.lengths[idx] != 0:
+            self.in_flight -= 1
+        self.acked[idx] = 1
+        self.lengths[idx] = 0
+
+    def nbytes(self) -> int:
+        """Total bytes held by the slab and the per-slot tables."""
+        tables = (self.seqs, self.lengths, self.acked, self.retries, self.sent_at)
+        return len(self._slab) + sum(t.itemsize * len(t) for t in tables)
+
+    def bytes_per_packet(self) -> float:
+        return self.nbytes() / self.size
+
+
+class ReceiveWindow:
+    """
+    Reorder window for the reliable channel tracked as an integer bitmask.
+
+    Bit i of the mask is set once seq base_seq + i has been received (or given
+    up on), so the next deliverable run and the head-of-line gap fall out of
+    bit operations instead of scans over the window.
+    """
+
+    __slots__ = ("size", "base_seq", "_mask", "_buffer", "_arrived_at")
+
+    def __init__(self, size: int = WINDOW_SIZE):
+        self.size = size
+        self.base_seq = 0  # smallest expected seq in window
+        self._mask = 0
+        self._buffer: List[Tuple[int, int, bytes] | None] = [None] * size  # (seq, sent_timestamp, payload)
+        self._arrived_at = array("d", [0.0]) * size
+
+    def offset(self, seq: int) -> int:
+        return (seq - self.base_seq) % MAX_SEQ_NUM
+
+    def is_received(self, seq: int) -> bool:
+        return bool(self._mask >> self.offset(seq) & 1)
+
+    def has_gap(self) -> bool:
+        """Whether packets are buffered behind a missing one."""
+        return self._mask != 0
+
+    def store(self, seq: int, entry: Tuple[int, int, bytes], arrived_at: float) -> bool:
+        """Buffer a packet for seq, returns False if it was a duplicate."""
+        bit = 1 << self.offset(seq)
+        if self._mask & bit:
+            return False
+
+        self._mask |= bit
+        self._buffer[seq % self.size] = entry
+        self._arrived_at[seq % self.size] = arrived_at
+        return True
+
+    def pop_ready(self) -> List[Tuple[int, int, bytes] | None]:
+        """Remove and return the in-order run at the head, None for skipped seqs."""
+        run = (self._mask ^ (self._mask + 1)).bit_length() - 1  # trailing ones
+        if run == 0:
+            return []
+
+        ready = []
+        for i in range(run):
+            idx = (self.base_seq + i) % self.size
+            ready.append(self._buffer[idx])
+            self._buffer[idx] = None
+
+        self._mask >>= run
+        self.base_seq = (self.base_seq + run) % MAX_SEQ_NUM
+        return ready
+
+    def _buffered_offsets(self):
+        mask = self._mask
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+    def oldest_arrival(self) -> float:
+        """Arrival time of the packet that has waited longest behind a gap."""
+        return min(self._arrived_at[(self.base_seq + off) % self.size] for off in self._buffered_offsets())
+
+    def skip_expired(self, now: float, timeout: float) -> List[int]:
+        """
+        Give up on every missing seq before the last packet that has waited
+        timeout or longer by now. The skipped seqs are marked as received and
+        returned.
+        """
+        # Compare against arrival + timeout, exactly as the deadline was computed,
+        # since (arrival + timeout) - timeout may round to just below arrival
+        last = -1
+        for off in self._buffered_offsets():
+            if self._arrived_at[(self.base_seq + off) % self.size] + timeout <= now:
+                last = off
+        if last < 0:
+            return []
+
+        below = (1 << last) - 1
+        holes = ~self._mask & below
+        self._mask |= below
+
+        skipped = []
+        while holes:
+            low = holes & -holes
+            skipped.append((self.base_seq + low.bit_length() - 1) % MAX_SEQ_NUM)
+            holes ^= low
+        return skipped
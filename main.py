@@ -1,6 +1,8 @@
 import asyncio
 import threading
 
+from game_net_api import PacketTracer
+from game_net_api.tracing import export_chrome_trace, format_summary, summarize
 from receiver_app import ReceiverApp
 from sender_app import SenderApp
 
@@ -24,6 +26,7 @@ def print_metrics(sender_metric, receiver_metric, duration_s: float = 1.0):
     jitter = receiver_metric.get("jitter_ms", 0.0)
     latency_min = receiver_metric.get("latency_min_ms", 0.0)
     latency_max = receiver_metric.get("latency_max_ms", 0.0)
+    rtt = receiver_metric.get("rtt_ms", 0.0)
 
     print("--------------------------------------------------")
     print(f"Sent packets:       {sent_packets}")
@@ -35,6 +38,7 @@ def print_metrics(sender_metric, receiver_metric, duration_s: float = 1.0):
     print(f"Latency (avg):      {avg_latency:.2f} ms")
     print(f"Latency (min/max):  {latency_min:.2f} / {latency_max:.2f} ms")
     print(f"Jitter (RFC3550):   {jitter:.2f} ms")
+    print(f"RTT (estimated):    {rtt:.2f} ms")
     print("--------------------------------------------------\n")
 
 
@@ -42,12 +46,18 @@ async def main():
     # Fix sender-receiver address for testing with custom network conditions
     receiver_addr = ("127.0.0.1", 50000)
     sender_addr = ("127.0.0.1", 50001) 
-    receiver_app = ReceiverApp(receiver_addr) # listen on receiver_addr
-    sender_app = SenderApp(sender_addr, receiver_addr) # send to receiver_addr
-
     send_rate = 100.0  # packets per second
     test_duration = 30.0  # seconds
 
+    # Set to e.g. "trace.json" to record packet lifecycles (open in ui.perfetto.dev or chrome://tracing)
+    trace_path = None
+    trace_sample_every = 1  # trace every n-th seq only, to bound overhead at high rates
+    sender_tracer = PacketTracer("Sender", sample_every=trace_sample_every) if trace_path else None
+    receiver_tracer = PacketTracer("Receiver", sample_every=trace_sample_every) if trace_path else None
+
+    receiver_app = ReceiverApp(receiver_addr, receiver_tracer) # listen on receiver_addr
+    sender_app = SenderApp(sender_addr, receiver_addr, sender_tracer) # send to receiver_addr
+
     def start_receiver_loop():
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
@@ -79,6 +89,11 @@ async def main():
     print("Reliable Channel Metrics:")
     print_metrics(sender_reliable_metric, receiver_reliable_metric)
 
+    if trace_path:
+        export_chrome_trace(trace_path, sender_tracer, receiver_tracer)
+        print(f"Packet trace written to {trace_path}")
+        print(format_summary(summarize(sender_tracer, receiver_tracer)))
+
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -1,12 +1,12 @@
 import asyncio
 from typing import Tuple
 
-from game_net_api import GameNetReceiver, DeliveredDataStruct
+from game_net_api import GameNetReceiver, DeliveredDataStruct, PacketTracer
 
 class ReceiverApp:
-    def __init__(self, bind_addr: Tuple[str, int]):
+    def __init__(self, bind_addr: Tuple[str, int], tracer: PacketTracer | None = None):
         self._bind_addr = bind_addr
-        self._receiver = GameNetReceiver("Receiver")
+        self._receiver = GameNetReceiver("Receiver", tracer=tracer)
 
     async def run(self, duration: float):
         """Run the receiver for a specified duration."""
@@ -1,14 +1,14 @@
 import asyncio
 from typing import Tuple
 
-from game_net_api import GameNetSender
+from game_net_api import GameNetSender, PacketTracer
 
 
 class SenderApp:
-    def __init__(self,  bind_addr:Tuple[str, int], dest_addr: Tuple[str, int]):
+    def __init__(self,  bind_addr:Tuple[str, int], dest_addr: Tuple[str, int], tracer: PacketTracer | None = None):
         self._bind_addr = bind_addr
         self._dest_addr = dest_addr
-        self._sender = GameNetSender("Sender")
+        self._sender = GameNetSender("Sender", tracer=tracer)
 
     async def run(self, rate: float, duration: float):
         """Run the sender to send packets to the dest_addr at a specified rate and duration."""